@@ -3,42 +3,93 @@ import io
 import json
 import random
 import math
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import requests
+from requests.adapters import HTTPAdapter
 from litellm import completion
 from groq import Groq
-import tempfile
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 st.set_page_config(page_title="Voice Note Thumbnail Generator", page_icon="🎤", layout="wide")
 
+# Downloaded emoji images persist here so app restarts skip the network
+EMOJI_CACHE_DIR = Path.home() / ".cache" / "voice-note-thumbnail"
+
+# Native size of the Twemoji PNG assets
+TWEMOJI_SIZE = 72
+
+@st.cache_resource(show_spinner=False)
+def _http_session():
+    """Process-wide session so emoji downloads reuse keep-alive connections
+    across reruns instead of paying a TCP + TLS handshake each"""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+    return session
+
+def _save_emoji_cache(emoji_img, cache_path):
+    """Write an emoji PNG to the disk cache atomically, ignoring failures"""
+    try:
+        EMOJI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a unique temp file and rename it into place, so concurrent
+        # sessions never read a half-written PNG
+        fd, tmp_name = tempfile.mkstemp(dir=EMOJI_CACHE_DIR, suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            emoji_img.save(tmp_file, 'PNG')
+        os.replace(tmp_name, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+
 @st.cache_data
 def get_emoji_image(emoji, size=64):
     """Download emoji image from Twemoji and return PIL Image"""
+    # Check the on-disk cache first
     try:
-        # Convert emoji to unicode codepoint
-        codepoint = format(ord(emoji), 'x')
-        
-        # Twemoji URL format - use larger source image for better quality
-        url = f"https://twemoji.maxcdn.com/v/latest/svg/{codepoint}.svg"
-        
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            # For SVG, we'll try PNG as backup since PIL doesn't handle SVG well
-            pass
-    except:
-        pass
+        cache_path = EMOJI_CACHE_DIR / f"{format(ord(emoji), 'x')}_{size}.png"
+    except TypeError:
+        cache_path = None  # Multi-codepoint emoji, not cached on disk
     
-    # Try PNG version
+    if cache_path is not None and cache_path.exists():
+        try:
+            emoji_img = Image.open(cache_path)
+            emoji_img.load()
+            return emoji_img
+        except Exception:
+            # Unreadable entry: drop it so the download below replaces it
+            try:
+                cache_path.unlink()
+            except OSError:
+                pass
+    
+    # Download the PNG version (PIL doesn't handle SVG well)
     try:
         codepoint = format(ord(emoji), 'x')
-        url = f"https://twemoji.maxcdn.com/v/latest/72x72/{codepoint}.png"
+        url = f"https://twemoji.maxcdn.com/v/latest/{TWEMOJI_SIZE}x{TWEMOJI_SIZE}/{codepoint}.png"
         
-        response = requests.get(url, timeout=5)
+        response = _http_session().get(url, timeout=5)
         if response.status_code == 200:
             emoji_img = Image.open(io.BytesIO(response.content))
-            # Use high-quality resampling for better results
-            emoji_img = emoji_img.resize((size, size), Image.Resampling.LANCZOS)
+            emoji_img.load()
+            # Serve native-size emojis as is; LANCZOS only pays off for real rescaling
+            ratio = emoji_img.width / size
+            if ratio != 1:
+                resample = Image.Resampling.BILINEAR if abs(ratio - 1) < 0.2 else Image.Resampling.LANCZOS
+                emoji_img = emoji_img.resize((size, size), resample)
+            
+            # Persist for future runs; a failed write only costs a refetch
+            if cache_path is not None:
+                _save_emoji_cache(emoji_img, cache_path)
             return emoji_img
     except:
         pass
@@ -48,7 +99,8 @@ def get_emoji_image(emoji, size=64):
     draw = ImageDraw.Draw(img)
     colors = [(255, 100, 100), (100, 255, 100), (100, 100, 255), 
               (255, 255, 100), (255, 100, 255), (100, 255, 255)]
-    color = random.choice(colors)
+    # Derive the color from the emoji so every size and rerun gets the same one
+    color = colors[sum(map(ord, emoji)) % len(colors)]
     # Add gradient effect for better quality
     for i in range(size//4):
         shade = int(255 * (1 - i/(size//4) * 0.3))
@@ -56,6 +108,57 @@ def get_emoji_image(emoji, size=64):
         draw.ellipse([i, i, size-i-1, size-i-1], fill=circle_color)
     return img
 
+def fetch_emoji_images(emojis, size=64):
+    """Download several emoji images in parallel, returning {emoji: PIL Image}"""
+    emojis = list(emojis)
+    if not emojis:
+        return {}
+    
+    # Worker threads need the script context to use st.cache_data quietly
+    ctx = get_script_run_ctx()
+    def init_worker():
+        add_script_run_ctx(threading.current_thread(), ctx)
+    
+    with ThreadPoolExecutor(max_workers=min(10, len(emojis)), initializer=init_worker) as executor:
+        images = executor.map(lambda emoji: get_emoji_image(emoji, size), emojis)
+        return dict(zip(emojis, images))
+
+# Bold fonts to try, in order of preference
+FONT_PATHS = [
+    "/System/Library/Fonts/Arial Bold.ttc",
+    "/System/Library/Fonts/Helvetica-Bold.ttc",
+    "/System/Library/Fonts/Arial.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/Windows/Fonts/arialbd.ttf",
+    "/Windows/Fonts/arial.ttf",
+    "/System/Library/Fonts/Helvetica.ttc"
+]
+
+@st.cache_resource(show_spinner=False)
+def _get_font(path, size):
+    """Return a TrueType font, parsing each (path, size) once per process"""
+    return ImageFont.truetype(path, size)
+
+def _can_open_truetype(path):
+    """Check that a font file exists and FreeType can load it"""
+    if not os.path.exists(path):
+        return False
+    try:
+        _get_font(path, 20)
+        return True
+    except OSError:
+        return False
+
+@st.cache_resource(show_spinner=False)
+def _resolve_font_path():
+    """Return the first usable font in FONT_PATHS, or None"""
+    return next((p for p in FONT_PATHS if _can_open_truetype(p)), None)
+
+# Probed once per process; None means falling back to Pillow's default font
+FONT_PATH = _resolve_font_path()
+if FONT_PATH is None:
+    st.warning("No TrueType font found, using Pillow's default font")
+
 def main():
     st.title("🎤 Voice Note Thumbnail Generator")
     st.markdown("Upload a voice note and generate a visual thumbnail with quotes and emojis!")
@@ -79,6 +182,8 @@ def main():
                     quotes_data = process_voice_note_data(uploaded_file)
                     st.session_state.quotes_data = quotes_data
                     st.session_state.has_data = True
+                    # Fixed per voice note so re-renders keep the same background
+                    st.session_state.thumbnail_seed = random.randrange(2**32)
                     
                 except Exception as e:
                     st.error(f"Error processing voice note: {str(e)}")
@@ -102,8 +207,13 @@ def main():
             
             # Generate thumbnail with current settings
             with st.spinner("Generating thumbnail..."):
-                thumbnail = create_thumbnail(st.session_state.quotes_data, text_size_multiplier)
+                thumbnail = create_thumbnail(
+                    st.session_state.quotes_data,
+                    text_size_multiplier,
+                    seed=st.session_state.get('thumbnail_seed', 0)
+                )
             
+            # Rendered once at full resolution; st.image scales it for display
             st.image(thumbnail, caption="Your Voice Note Thumbnail", width=400)
             
             # Option to download
@@ -124,6 +234,8 @@ def main():
                     del st.session_state.has_data
                 if 'quotes_data' in st.session_state:
                     del st.session_state.quotes_data
+                if 'thumbnail_seed' in st.session_state:
+                    del st.session_state.thumbnail_seed
                 st.rerun()
 
             # Live prompt editor
@@ -177,39 +289,75 @@ Only respond with valid JSON, no other text."""
             st.write(st.session_state.transcript)
 
 def process_voice_note_data(uploaded_file):
-    # Save uploaded file temporarily
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-        tmp_file.write(uploaded_file.read())
-        tmp_path = tmp_file.name
+    # Initialize Groq client
+    client = Groq()
     
-    try:
-        # Initialize Groq client
-        client = Groq()
-        
-        # Transcribe using Groq Whisper 3
-        st.info("Transcribing audio with Groq Whisper 3 Turbo...")
-        
-        with open(tmp_path, "rb") as audio_file:
-            transcription = client.audio.transcriptions.create(
-                file=(tmp_path, audio_file.read()),
-                model="whisper-large-v3-turbo",
-                response_format="verbose_json",
-            )
-        
-        transcript = transcription.text
-        st.write("**Transcript:**", transcript)
-        
-        # Store transcript in session state for later use
-        st.session_state.transcript = transcript
-        
-        # Extract quotes and get emojis using Llama 70B
-        quotes_data = extract_quotes_and_emojis(transcript)
-        
-        return quotes_data
-        
-    finally:
-        # Clean up temp file
-        os.unlink(tmp_path)
+    # Transcribe using Groq Whisper 3
+    st.info("Transcribing audio with Groq Whisper 3 Turbo...")
+    
+    # Send the uploaded bytes directly; the file name tells Groq the format
+    transcription = client.audio.transcriptions.create(
+        file=(uploaded_file.name, uploaded_file.getvalue()),
+        model="whisper-large-v3-turbo",
+        response_format="verbose_json",
+    )
+    
+    transcript = transcription.text
+    st.write("**Transcript:**", transcript)
+    
+    # Store transcript in session state for later use
+    st.session_state.transcript = transcript
+    
+    # Extract quotes and get emojis using Llama 70B
+    quotes_data = extract_quotes_and_emojis(transcript)
+    
+    return quotes_data
+
+def strip_json_fences(json_text):
+    """Return the JSON inside a markdown code fence, or the text itself if unfenced"""
+    if "```" in json_text:
+        json_text = json_text.split("```", 2)[1]
+        if json_text.startswith("json"):
+            json_text = json_text[len("json"):]
+    return json_text.strip()
+
+def stream_completion(prompt, label):
+    """Stream the LLM response, showing quotes as soon as each one is complete"""
+    response = completion(
+        model="groq/llama-3.3-70b-versatile",
+        messages=[{
+            "role": "user", 
+            "content": prompt
+        }],
+        max_tokens=1000,
+        temperature=0,
+        # No response_format: litellm fakes streaming for Groq when it is set
+        stream=True
+    )
+    
+    placeholder = st.empty()
+    json_text = ""
+    shown = 0
+    for chunk in response:
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        json_text += delta
+        
+        quotes = parse_streamed_quotes(json_text)
+        if len(quotes) > shown:
+            shown = len(quotes)
+            placeholder.write(label, [f"'{k.get('text')}' ({k.get('importance')})" for k in quotes])
+    
+    # The caller displays the final parsed result
+    placeholder.empty()
+    return json_text
+
+@st.cache_data(show_spinner=False)
+def _cached_extract(prompt, _label):
+    """Run the extraction prompt once per distinct prompt (which embeds the transcript)"""
+    # The leading underscore keeps the display label out of the cache key
+    return json.loads(strip_json_fences(stream_completion(prompt, _label)))
 
 def extract_quotes_and_emojis(transcript):
     st.info("Extracting quotes and emojis with Llama 70B...")
@@ -243,24 +391,7 @@ def extract_quotes_and_emojis(transcript):
     """
     
     try:
-        response = completion(
-            model="groq/llama-3.3-70b-versatile",
-            messages=[{
-                "role": "user", 
-                "content": prompt
-            }],
-            max_tokens=1000,
-            temperature=0.3
-        )
-        
-        # Extract JSON from response
-        json_text = response.choices[0].message.content
-        if "```json" in json_text:
-            json_text = json_text.split("```json")[1].split("```")[0]
-        elif "```" in json_text:
-            json_text = json_text.split("```")[1].split("```")[0]
-        
-        data = json.loads(json_text.strip())
+        data = _cached_extract(prompt, "**Key Quotes:**")
         
         st.write("**Key Quotes:**", [f"'{k['text']}' ({k['importance']})" for k in data['quotes']])
         st.write("**Emojis:**", [f"{e['emoji']} ({e['weight']})" for e in data['emojis']])
@@ -283,24 +414,7 @@ def extract_quotes_with_custom_prompt(transcript, custom_prompt):
     formatted_prompt = custom_prompt.format(transcript=transcript)
     
     try:
-        response = completion(
-            model="groq/llama-3.3-70b-versatile",
-            messages=[{
-                "role": "user", 
-                "content": formatted_prompt
-            }],
-            max_tokens=1000,
-            temperature=0.3
-        )
-        
-        # Extract JSON from response
-        json_text = response.choices[0].message.content
-        if "```json" in json_text:
-            json_text = json_text.split("```json")[1].split("```")[0]
-        elif "```" in json_text:
-            json_text = json_text.split("```")[1].split("```")[0]
-        
-        data = json.loads(json_text.strip())
+        data = _cached_extract(formatted_prompt, "**Updated Quotes:**")
         
         st.write("**Updated Quotes:**", [f"'{k['text']}' ({k['importance']})" for k in data['quotes']])
         st.write("**Updated Emojis:**", [f"{e['emoji']} ({e['weight']})" for e in data['emojis']])
@@ -315,26 +429,39 @@ def extract_quotes_with_custom_prompt(transcript, custom_prompt):
             "emojis": [{"emoji": "🎤", "weight": 5}]
         }
 
-def create_thumbnail(data, text_size_multiplier=1.0):
+# Pixel constants in the layout code were tuned at this size and scale with the render size
+REFERENCE_SIZE = 1024
+# Resolution of the rendered (and downloaded) thumbnail
+EXPORT_SIZE = 1024
+
+def create_thumbnail(data, text_size_multiplier=1.0, size=EXPORT_SIZE, seed=0):
     st.info("Generating thumbnail image...")
     
-    # High resolution image dimensions
-    size = 1024  # Doubled for higher quality
+    # Background only depends on the emojis, so slider changes reuse it
+    emojis = tuple((e['emoji'], e['weight']) for e in data['emojis'])
+    img = create_background_layer(emojis, size, seed)
+    
+    # Add quote text overlay with custom size
+    add_text_overlay(img, size, data['quotes'], text_size_multiplier)
+    
+    return img
+
+@st.cache_data(show_spinner=False)
+def create_background_layer(emojis, size, seed):
+    """Render the gradient and emoji layers; emojis is a tuple of (emoji, weight)"""
+    rng = random.Random(seed)
     
     # Create gradient background
-    img = create_gradient_background(size)
+    img = create_gradient_background(size, rng)
     
     # Create emoji background
-    create_emoji_background(img, size, data['emojis'])
-    
-    # Add quote text overlay with custom size
-    add_text_overlay(img, size, data['quotes'], text_size_multiplier)
+    create_emoji_background(img, size, [{'emoji': e, 'weight': w} for e, w in emojis], rng)
     
+    # st.cache_data hands every caller its own copy, so the text overlay can draw on it
     return img
 
-def create_gradient_background(size):
+def create_gradient_background(size, rng=random):
     # Create a subtle gradient background
-    img = Image.new('RGB', (size, size))
     
     # Color palette options
     palettes = [
@@ -346,22 +473,28 @@ def create_gradient_background(size):
     ]
     
     # Randomly select a palette
-    colors = random.choice(palettes)
-    
-    pixels = []
-    for y in range(size):
-        ratio = y / size
-        r = int(colors[0][0] * (1 - ratio) + colors[1][0] * ratio)
-        g = int(colors[0][1] * (1 - ratio) + colors[1][1] * ratio)
-        b = int(colors[0][2] * (1 - ratio) + colors[1][2] * ratio)
-        
-        for _ in range(size):
-            pixels.append((r, g, b))
+    colors = rng.choice(palettes)
     
-    img.putdata(pixels)
-    return img
+    # Interpolate one RGB value per row, then broadcast it across every column
+    ratio = (np.arange(size) / size)[:, None]
+    top = np.array(colors[0], dtype=np.float64)
+    bottom = np.array(colors[1], dtype=np.float64)
+    rows = (top * (1 - ratio) + bottom * ratio).astype(np.uint8)
+    pixels = np.broadcast_to(rows[:, None, :], (size, size, 3))
+    
+    return Image.fromarray(np.ascontiguousarray(pixels), 'RGB')
 
-def create_emoji_background(img, size, emojis):
+# Opacity of the background emojis
+EMOJI_OPACITY = 0.6
+
+def _composite_sprites(canvas, rgb, alpha, order, xs, ys):
+    """Alpha-blend sprites rgb[order[i]] onto canvas at (xs[i], ys[i]), in order"""
+    height, width = rgb.shape[1], rgb.shape[2]
+    for s, x, y in zip(order, xs, ys):
+        region = canvas[y:y + height, x:x + width]
+        region += (rgb[s] - region) * alpha[s]
+
+def create_emoji_background(img, size, emojis, rng=random):
     try:
         # Create grid of emojis based on weights - more emojis for full coverage
         emoji_positions = []
@@ -370,32 +503,38 @@ def create_emoji_background(img, size, emojis):
             for _ in range(count):
                 emoji_positions.append(emoji_data['emoji'])
         
+        if not emoji_positions:
+            return
+        
         # Shuffle for random placement
-        random.shuffle(emoji_positions)
+        rng.shuffle(emoji_positions)
         
         # Calculate emoji size for the image
-        emoji_size = 64  # Larger emoji size
-        
-        # Place emojis randomly across the entire image for even distribution
-        for emoji in emoji_positions:
-            # Random position across the entire image
-            x = random.randint(0, size - emoji_size)
-            y = random.randint(0, size - emoji_size)
-            
-            # Get emoji image
-            emoji_img = get_emoji_image(emoji, emoji_size)
-            
-            # Create semi-transparent version
-            if emoji_img.mode != 'RGBA':
-                emoji_img = emoji_img.convert('RGBA')
-            
-            # Apply moderate transparency
-            alpha = emoji_img.split()[-1]
-            alpha = alpha.point(lambda p: int(p * 0.6))  # 60% opacity (more visible)
-            emoji_img.putalpha(alpha)
-            
-            # Paste onto background
-            img.paste(emoji_img, (int(x), int(y)), emoji_img)
+        scale = size / REFERENCE_SIZE
+        emoji_size = int(64 * scale)  # Larger emoji size
+        
+        # Fetch each unique emoji once, concurrently, before placing them
+        emoji_images = fetch_emoji_images(set(emoji_positions), emoji_size)
+        
+        # Stack each emoji once into float RGB and a 60% opacity alpha (more visible)
+        sprite_emojis = list(emoji_images)
+        rgba = np.stack([np.asarray(emoji_images[e].convert('RGBA'), dtype=np.float32)
+                         for e in sprite_emojis])
+        sprite_rgb = np.ascontiguousarray(rgba[..., :3])
+        sprite_alpha = rgba[..., 3:] * np.float32(EMOJI_OPACITY / 255)
+        sprite_index = {emoji: i for i, emoji in enumerate(sprite_emojis)}
+        
+        # Place emojis randomly across the entire image for even distribution;
+        # positions are drawn as fractions so every render size gets the same layout
+        order = np.array([sprite_index[emoji] for emoji in emoji_positions], dtype=np.int64)
+        xs = np.array([int(rng.random() * (size - emoji_size + 1)) for _ in emoji_positions], dtype=np.int64)
+        ys = np.array([int(rng.random() * (size - emoji_size + 1)) for _ in emoji_positions], dtype=np.int64)
+        
+        # Blend every emoji on a float canvas and convert back to pixels only once
+        canvas = np.array(img.convert('RGB'), dtype=np.float32)
+        _composite_sprites(canvas, sprite_rgb, sprite_alpha, order, xs, ys)
+        
+        img.paste(Image.fromarray((canvas + 0.5).astype(np.uint8), 'RGB'))
                 
     except Exception as e:
         st.warning(f"Using fallback background: {e}")
@@ -403,11 +542,12 @@ def create_emoji_background(img, size, emojis):
         draw = ImageDraw.Draw(img)
         colors = [(255, 200, 200, 150), (200, 255, 200, 150), (200, 200, 255, 150), 
                   (255, 255, 200, 150), (255, 200, 255, 150), (200, 255, 255, 150)]
+        scale = size / REFERENCE_SIZE
         for _ in range(80):  # Many more shapes for full coverage
-            x = random.randint(0, size - 60)
-            y = random.randint(0, size - 60)
-            color = random.choice(colors)
-            shape_size = random.randint(30, 80)
+            x = rng.randint(0, size - int(60 * scale))
+            y = rng.randint(0, size - int(60 * scale))
+            color = rng.choice(colors)
+            shape_size = rng.randint(int(30 * scale), int(80 * scale))
             draw.ellipse([x, y, x + shape_size, y + shape_size], fill=color)  # Various sizes
 
 def wrap_text(text, font, max_width):
@@ -415,18 +555,23 @@ def wrap_text(text, font, max_width):
     words = text.split()
     lines = []
     current_line = []
+    current_width = 0
+    
+    # Measure each word and the space once, then fill lines by summing widths
+    space_width = font.getlength(' ')
     
     for word in words:
-        test_line = ' '.join(current_line + [word])
-        bbox = ImageDraw.Draw(Image.new('RGB', (1, 1))).textbbox((0, 0), test_line, font=font)
-        test_width = bbox[2] - bbox[0]
+        word_width = font.getlength(word)
+        test_width = current_width + space_width + word_width if current_line else word_width
         
         if test_width <= max_width:
             current_line.append(word)
+            current_width = test_width
         else:
             if current_line:
                 lines.append(' '.join(current_line))
                 current_line = [word]
+                current_width = word_width
             else:
                 lines.append(word)  # Word is too long, but add it anyway
     
@@ -440,68 +585,24 @@ def add_text_overlay(img, size, quotes, text_size_multiplier=1.0):
     quotes.sort(key=lambda k: k['importance'], reverse=True)
     
     draw = ImageDraw.Draw(img)
-    
-    try:
-        # Try to load a nice bold font
-        font_paths = [
-            "/System/Library/Fonts/Arial Bold.ttc",
-            "/System/Library/Fonts/Helvetica-Bold.ttc",
-            "/System/Library/Fonts/Arial.ttc",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/Windows/Fonts/arialbd.ttf",
-            "/Windows/Fonts/arial.ttf"
-        ]
-        base_font = None
-        for font_path in font_paths:
-            try:
-                ImageFont.truetype(font_path, 20)  # Test if font works
-                base_font = font_path
-                break
-            except:
-                continue
-    except:
-        pass
+    scale = size / REFERENCE_SIZE
     
     y_offset = size // 12  # Start higher up
-    max_text_width = size - 120  # Leave margins
+    max_text_width = size - int(120 * scale)  # Leave margins
     
     for quote in quotes:  # Limit to top 3 quotes
         # Calculate font size based on importance - MASSIVE text
         base_size = size // 4  # Much bigger base (1024/4 = 256px base!)
         font_size = int(base_size * (quote['importance'] / 10) * text_size_multiplier)
-        font_size = max(int(150 * text_size_multiplier), min(font_size, int(size // 2 * text_size_multiplier)))  # Apply multiplier
+        font_size = max(int(150 * scale * text_size_multiplier), min(font_size, int(size // 2 * text_size_multiplier)))  # Apply multiplier
         
         text = quote['text']
         
         # Load font - force a real font, not default
-        font = None
-        if base_font:
-            try:
-                font = ImageFont.truetype(base_font, font_size)
-                print(f"Loaded font {base_font} at size {font_size}")
-            except Exception as e:
-                print(f"Failed to load {base_font}: {e}")
-        
-        # If no font loaded, try system fonts directly
-        if font is None:
-            system_fonts = [
-                "/System/Library/Fonts/Arial.ttc",
-                "/System/Library/Fonts/Helvetica.ttc"
-            ]
-            for font_path in system_fonts:
-                try:
-                    font = ImageFont.truetype(font_path, font_size)
-                    print(f"Loaded system font {font_path} at size {font_size}")
-                    break
-                except:
-                    continue
-        
-        # Absolute fallback - but still try to make it big
-        if font is None:
-            print(f"Using default font - this might be small!")
-            font = ImageFont.load_default()
-        
-        # Show debug info in Streamlit
+        if FONT_PATH:
+            font = _get_font(FONT_PATH, font_size)
+        else:
+            font = ImageFont.load_default(font_size)
         
         # Wrap text if needed
         lines = wrap_text(text, font, max_text_width)
@@ -520,7 +621,7 @@ def add_text_overlay(img, size, quotes, text_size_multiplier=1.0):
         total_height += line_spacing * (len(lines) - 1)
         
         # Check if text fits vertically
-        if y_offset + total_height < size - 100:
+        if y_offset + total_height < size - int(100 * scale):
             current_y = y_offset
             
             for i, line in enumerate(lines):
@@ -532,19 +633,14 @@ def add_text_overlay(img, size, quotes, text_size_multiplier=1.0):
                 # Center line horizontally
                 x = (size - line_width) // 2
                 
-                # Draw text outline for visibility - very thick
-                outline_width = 4
-                for dx in range(-outline_width, outline_width + 1):
-                    for dy in range(-outline_width, outline_width + 1):
-                        if dx != 0 or dy != 0:
-                            draw.text((x + dx, current_y + dy), line, font=font, fill='white')
-                
-                # Draw main text
-                draw.text((x, current_y), line, font=font, fill='black')
+                # Draw main text with a thick white outline for visibility
+                outline_width = max(1, round(4 * scale))
+                draw.text((x, current_y), line, font=font, fill='black',
+                          stroke_width=outline_width, stroke_fill='white')
                 
                 current_y += line_height + line_spacing
             
-            y_offset = current_y + 40  # Space between quotes
+            y_offset = current_y + int(40 * scale)  # Space between quotes
 
 if __name__ == "__main__":
     main()
\ No newline at end of file